@@ -5,13 +5,74 @@ load_dotenv()
 
 class Config:
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///data_processing.db')
+    DB_POOL_SIZE = 8
     
     CSV_URL = "https://tyroo-engineering-assesments.s3.us-west-2.amazonaws.com/Tyroo-dummy-data.csv.gz"
     DOWNLOAD_PATH = "data/downloaded_data.csv.gz"
+    DECOMPRESSED_PATH = "data/downloaded_data.csv"
     PROCESSED_DATA_PATH = "data/processed_data.csv"
     
+    DOWNLOAD_WORKERS = 8
+    DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+    
     CHUNK_SIZE = 10000
-    BATCH_SIZE = 1000
+    CSV_BLOCK_SIZE = 64 * 1024 * 1024
+    BATCH_SIZE = 20000
+    PREFETCH_CHUNKS = 4
+    
+    # Explicit schema for the source CSV so parsers skip per-chunk type inference
+    COLUMN_DTYPES = {
+        'platform_commission_rate': 'float64',
+        'venture_category3_name_en': 'string',
+        'product_small_img': 'string',
+        'deeplink': 'string',
+        'availability': 'string',
+        'image_url_5': 'string',
+        'number_of_reviews': 'Int32',
+        'is_free_shipping': 'Int8',
+        'promotion_price': 'float64',
+        'venture_category2_name_en': 'string',
+        'current_price': 'float64',
+        'product_medium_img': 'string',
+        'venture_category1_name_en': 'string',
+        'brand_name': 'string',
+        'image_url_4': 'string',
+        'description': 'string',
+        'seller_url': 'string',
+        'product_commission_rate': 'float64',
+        'product_name': 'string',
+        'sku_id': 'string',
+        'seller_rating': 'float64',
+        'bonus_commission_rate': 'float64',
+        'business_type': 'string',
+        'business_area': 'string',
+        'image_url_2': 'string',
+        'discount_percentage': 'float64',
+        'seller_name': 'string',
+        'product_url': 'string',
+        'product_id': 'string',
+        'venture_category_name_local': 'string',
+        'rating_avg_value': 'float64',
+        'product_big_img': 'string',
+        'image_url_3': 'string',
+        'price': 'float64'
+    }
+    NA_VALUES = ['', 'NA']
+    
+    # Columns that identify a product row for duplicate removal
+    DEDUP_COLUMNS = ['product_id', 'sku_id']
+    
+    # String columns with at most this share of distinct values become categoricals
+    CATEGORY_MAX_UNIQUE_RATIO = 0.5
+    
+    # Low-cardinality text columns stored as integer keys into dimension tables
+    DIMENSION_COLUMNS = {
+        'brand_name': ('dim_brand', 'brand_id'),
+        'seller_name': ('dim_seller', 'seller_id'),
+        'venture_category1_name_en': ('dim_category1', 'category1_id'),
+        'venture_category2_name_en': ('dim_category2', 'category2_id'),
+        'venture_category3_name_en': ('dim_category3', 'category3_id')
+    }
     
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = "logs/data_processing.log" 
\ No newline at end of file
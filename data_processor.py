@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 
 import os
+import queue
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any
 
@@ -15,6 +19,8 @@ from utils.data_processor import DataProcessor
 
 logger = setup_logger(__name__)
 
+_END_OF_STREAM = object()
+
 class DataProcessingPipeline:
     def __init__(self):
         self.data_processor = DataProcessor()
@@ -31,13 +37,7 @@ class DataProcessingPipeline:
             if not self._download_file():
                 raise Exception("Failed to download CSV file")
             
-            df = self._read_and_process_data()
-            if df.empty:
-                raise Exception("No data found in CSV file")
-            
-            cleaned_df = self._clean_and_transform_data(df)
-            quality_metrics = self._validate_data_quality(cleaned_df)
-            inserted_rows = self._store_data_in_database(cleaned_df)
+            inserted_rows, quality_metrics = self._process_chunks()
             self._log_processing_results(inserted_rows, quality_metrics)
             
             self.end_time = datetime.now()
@@ -75,32 +75,151 @@ class DataProcessingPipeline:
         
         return success
     
-    def _read_and_process_data(self):
-        logger.info("Step 2: Reading CSV file in chunks")
+    def _process_chunks(self):
+        logger.info("Step 2: Streaming CSV chunks through clean, validate and store")
         
         if not os.path.exists(Config.DOWNLOAD_PATH):
             raise FileNotFoundError(f"Downloaded file not found: {Config.DOWNLOAD_PATH}")
         
-        df = self.data_processor.read_csv_in_chunks(Config.DOWNLOAD_PATH)
+        # Build indexes once after the bulk load instead of updating them per row
+        self._prepare_database()
+        self.db_manager.drop_indexes('processed_data')
+        try:
+            inserted_rows, quality_metrics = self._load_chunks()
+        except BaseException:
+            # Best effort only: a locked database usually fails here too, and the
+            # load error is the one worth reporting. The next run recreates them.
+            try:
+                self.db_manager.create_indexes()
+            except Exception as e:
+                logger.error(f"Failed to restore indexes after load error: {str(e)}")
+            raise
+        
+        self.db_manager.create_indexes()
+        
+        self._log_data_quality(quality_metrics)
+        
+        logger.info(f"Successfully streamed {self.data_processor.total_rows} rows from CSV file")
+        return inserted_rows, quality_metrics
+    
+    def _load_chunks(self):
+        inserted_rows = 0
+        quality_metrics = {
+            'total_records': 0,
+            'valid_records': 0,
+            'null_records': 0,
+            'duplicate_records': 0
+        }
+        
+        csv_path = self.data_processor.decompress_to_disk(Config.DOWNLOAD_PATH)
+        chunks = self._prefetch(self.data_processor.read_csv_in_chunks(csv_path))
+        
+        # SQLite allows one writer at a time, so all inserts go through a single
+        # dedicated thread while this thread keeps cleaning the next chunks
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer") as writer:
+            pending_writes = deque()
+            try:
+                for chunk_number, chunk in enumerate(chunks, start=1):
+                    cleaned_df = self._clean_and_transform_data(chunk)
+                    
+                    chunk_metrics = self._validate_data_quality(cleaned_df)
+                    for key, value in chunk_metrics.items():
+                        quality_metrics[key] += int(value)
+                    
+                    pending_writes.append(writer.submit(self._store_data_in_database, cleaned_df))
+                    logger.info(f"Chunk {chunk_number} cleaned and queued for insert")
+                    
+                    if len(pending_writes) >= Config.PREFETCH_CHUNKS:
+                        inserted_rows += pending_writes.popleft().result()
+                
+                while pending_writes:
+                    inserted_rows += pending_writes.popleft().result()
+            except BaseException:
+                for pending_write in pending_writes:
+                    pending_write.cancel()
+                raise
+            finally:
+                # Stop the reader thread now; the traceback would keep the generator alive
+                chunks.close()
         
-        if df.empty:
+        logger.info(f"Rows inserted: {inserted_rows}")
+        
+        if self.data_processor.total_rows == 0:
             raise ValueError("No data found in CSV file")
         
-        logger.info(f"Successfully read {len(df)} rows from CSV file")
-        return df
+        return inserted_rows, quality_metrics
+    
+    def _prefetch(self, iterable, maxsize: int = None):
+        """
+        Run an iterable on a background thread, buffering up to maxsize items.
+        
+        Lets decompression and parsing of the next chunks overlap with
+        cleaning and inserting the current one.
+        
+        Args:
+            iterable: Source of items, consumed on the background thread
+            maxsize: Maximum number of items buffered ahead of the consumer
+            
+        Yields:
+            Items from the iterable, in order
+        """
+        items = queue.Queue(maxsize=maxsize or Config.PREFETCH_CHUNKS)
+        stopped = threading.Event()
+        
+        def put(item):
+            # Give up once the consumer has gone away so the thread can exit
+            while not stopped.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for item in iterable:
+                    if not put(item):
+                        return
+                put(_END_OF_STREAM)
+            except BaseException as e:
+                put(e)
+            finally:
+                # Release the source (e.g. the CSV mmap) on this thread, where it runs
+                close = getattr(iterable, 'close', None)
+                if close is not None:
+                    close()
+        
+        producer = threading.Thread(target=produce, name="chunk-reader", daemon=True)
+        producer.start()
+        
+        try:
+            while True:
+                item = items.get()
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            producer.join()
     
     def _clean_and_transform_data(self, df):
-        logger.info("Step 3: Cleaning and transforming data")
+        logger.debug("Step 3: Cleaning and transforming chunk")
         
-        cleaned_df = self.data_processor.clean_data(df)
+        cleaned_df = self.data_processor.compact(self.data_processor.clean_data(df))
         
-        logger.info(f"Data cleaning completed. Processed {len(cleaned_df)} rows")
+        logger.debug(f"Chunk cleaning completed. Processed {len(cleaned_df)} rows")
         return cleaned_df
     
     def _validate_data_quality(self, df):
-        logger.info("Step 4: Validating data quality")
+        logger.debug("Step 4: Validating chunk data quality")
         
-        quality_metrics = self.data_processor.validate_data(df)
+        return self.data_processor.validate_data(df)
+    
+    def _log_data_quality(self, quality_metrics):
+        logger.info(f"Data quality metrics: {quality_metrics}")
         
         # Log quality metrics to database
         self.db_manager.log_data_quality_metrics(
@@ -110,25 +229,28 @@ class DataProcessingPipeline:
             null_records=quality_metrics['null_records'],
             duplicate_records=quality_metrics['duplicate_records']
         )
-        
-        return quality_metrics
+    
+    def _prepare_database(self):
+        # Create tables if they don't exist; indexes follow the load
+        logger.info("Creating database tables")
+        self.db_manager.create_tables_no_indexes()
     
     def _store_data_in_database(self, df):
-        logger.info("Step 5: Storing data in database")
+        logger.debug("Step 5: Storing chunk in database")
         
-        # Create tables if they don't exist
-        if not self.db_manager.table_exists('processed_data'):
-            logger.info("Creating database tables")
-            self.db_manager.create_tables()
+        df = self.db_manager.encode_dimensions(df)
         
         # Insert data into database
         inserted_rows = self.db_manager.insert_dataframe(
             df, 
             'processed_data',
-            Config.BATCH_SIZE
+            Config.BATCH_SIZE,
+            constant_values={
+                'source_file': os.path.basename(Config.DOWNLOAD_PATH),
+                'processing_batch': self.data_processor.batch_id
+            }
         )
         
-        logger.info(f"Successfully inserted {inserted_rows} rows into database")
         return inserted_rows
     
     def _log_processing_results(self, inserted_rows, quality_metrics):
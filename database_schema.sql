@@ -2,26 +2,52 @@
 -- This schema is designed to store processed CSV data efficiently
 -- SQLite compatible schema (default)
 
+-- Dimension tables for low-cardinality text columns
+CREATE TABLE IF NOT EXISTS dim_brand (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_seller (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_category1 (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_category2 (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_category3 (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
 -- Create the main table for processed data
 CREATE TABLE IF NOT EXISTS processed_data (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     -- CSV data columns
     platform_commission_rate REAL,
-    venture_category3_name_en TEXT,
+    category3_id INTEGER REFERENCES dim_category3(id),
     product_small_img TEXT,
     deeplink TEXT,
     availability TEXT,
-    image_url_5 REAL,
+    image_url_5 TEXT,
     number_of_reviews INTEGER,
     is_free_shipping INTEGER,
     promotion_price REAL,
-    venture_category2_name_en TEXT,
+    category2_id INTEGER REFERENCES dim_category2(id),
     current_price REAL,
     product_medium_img TEXT,
-    venture_category1_name_en TEXT,
-    brand_name TEXT,
-    image_url_4 REAL,
-    description REAL,
+    category1_id INTEGER REFERENCES dim_category1(id),
+    brand_id INTEGER REFERENCES dim_brand(id),
+    image_url_4 TEXT,
+    description TEXT,
     seller_url TEXT,
     product_commission_rate REAL,
     product_name TEXT,
@@ -32,13 +58,13 @@ CREATE TABLE IF NOT EXISTS processed_data (
     business_area TEXT,
     image_url_2 TEXT,
     discount_percentage REAL,
-    seller_name TEXT,
+    seller_id INTEGER REFERENCES dim_seller(id),
     product_url TEXT,
     product_id INTEGER,
     venture_category_name_local TEXT,
     rating_avg_value REAL,
     product_big_img TEXT,
-    image_url_3 REAL,
+    image_url_3 TEXT,
     price REAL,
     
     -- Metadata columns
@@ -53,8 +79,23 @@ CREATE INDEX IF NOT EXISTS idx_processed_data_created_at ON processed_data(creat
 CREATE INDEX IF NOT EXISTS idx_processed_data_source_file ON processed_data(source_file);
 CREATE INDEX IF NOT EXISTS idx_processed_data_product_id ON processed_data(product_id);
 CREATE INDEX IF NOT EXISTS idx_processed_data_sku_id ON processed_data(sku_id);
-CREATE INDEX IF NOT EXISTS idx_processed_data_brand_name ON processed_data(brand_name);
-CREATE INDEX IF NOT EXISTS idx_processed_data_seller_name ON processed_data(seller_name);
+CREATE INDEX IF NOT EXISTS idx_processed_data_brand_id ON processed_data(brand_id);
+CREATE INDEX IF NOT EXISTS idx_processed_data_seller_id ON processed_data(seller_id);
+
+-- Joins the dimension tables back in for human-readable queries
+CREATE VIEW IF NOT EXISTS processed_data_expanded AS
+SELECT p.*,
+       dim_brand.name AS brand_name,
+       dim_seller.name AS seller_name,
+       dim_category1.name AS venture_category1_name_en,
+       dim_category2.name AS venture_category2_name_en,
+       dim_category3.name AS venture_category3_name_en
+FROM processed_data p
+LEFT JOIN dim_brand ON dim_brand.id = p.brand_id
+LEFT JOIN dim_seller ON dim_seller.id = p.seller_id
+LEFT JOIN dim_category1 ON dim_category1.id = p.category1_id
+LEFT JOIN dim_category2 ON dim_category2.id = p.category2_id
+LEFT JOIN dim_category3 ON dim_category3.id = p.category3_id;
 
 -- Create a table to track processing status
 CREATE TABLE IF NOT EXISTS processing_log (
@@ -1,9 +1,12 @@
 import os
+import gzip
+import shutil
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 from datetime import datetime
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from utils.logger import setup_logger, log_execution_time
 
@@ -14,6 +17,9 @@ class DataProcessor:
         self.processed_rows = 0
         self.total_rows = 0
         self.batch_id = str(uuid.uuid4())
+        # Sorted uint64 key hashes of every row kept so far (8 bytes per row);
+        # each chunk's new keys are merged in at their sorted positions
+        self._seen_row_hashes = np.empty(0, dtype=np.uint64)
     
     @log_execution_time
     def download_file(self, url: str, file_path: str) -> bool:
@@ -23,12 +29,16 @@ class DataProcessor:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
             logger.info(f"Downloading file from: {url}")
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
+            total_size = self._get_content_length(url)
             
-            with open(file_path, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    file.write(chunk)
+            # Write to a temporary name so a failed download never looks complete
+            partial_path = file_path + '.partial'
+            if total_size and self._download_ranges(url, partial_path, total_size):
+                logger.info(f"Downloaded {total_size} bytes with parallel range requests")
+            else:
+                logger.info("Range download unavailable, using a single connection")
+                self._download_stream(url, partial_path)
+            os.replace(partial_path, file_path)
             
             logger.info(f"File downloaded successfully to: {file_path}")
             return True
@@ -37,34 +47,211 @@ class DataProcessor:
             logger.error(f"Failed to download file: {str(e)}")
             return False
     
-    def read_csv_in_chunks(self, file_path: str, chunk_size: int = None) -> pd.DataFrame:
+    def _get_content_length(self, url: str) -> int:
+        import requests
+        
+        # Presigned or proxied URLs often reject HEAD; that only rules out ranges
+        try:
+            head = requests.head(url, allow_redirects=True)
+            head.raise_for_status()
+            return int(head.headers.get('Content-Length', 0))
+        except (requests.RequestException, ValueError) as e:
+            logger.info(f"HEAD request failed, skipping range download: {str(e)}")
+            return 0
+    
+    def _download_ranges(self, url: str, file_path: str, total_size: int) -> bool:
+        workers = Config.DOWNLOAD_WORKERS
+        part_size = -(-total_size // workers)
+        ranges = [(start, min(start + part_size, total_size) - 1)
+                  for start in range(0, total_size, part_size)]
+        
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, total_size)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda byte_range: self._download_range(url, fd, *byte_range), ranges
+                ))
+        finally:
+            os.close(fd)
+        
+        return all(results)
+    
+    def _download_range(self, url: str, fd: int, start: int, end: int) -> bool:
+        import requests
+        
+        headers = {'Range': f'bytes={start}-{end}'}
+        with requests.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            # A plain 200 means the server ignored the Range header
+            if response.status_code != 206:
+                return False
+            
+            offset = start
+            for chunk in response.iter_content(chunk_size=Config.DOWNLOAD_CHUNK_BYTES):
+                view = memoryview(chunk)
+                while view:
+                    written = os.pwrite(fd, view, offset)
+                    view = view[written:]
+                    offset += written
+        
+        if offset != end + 1:
+            raise IOError(f"Incomplete range download: bytes {start}-{end}, got {offset - start}")
+        return True
+    
+    def _download_stream(self, url: str, file_path: str):
+        import requests
+        
+        with requests.get(url, stream=True) as response:
+            response.raise_for_status()
+            
+            with open(file_path, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=Config.DOWNLOAD_CHUNK_BYTES):
+                    file.write(chunk)
+    
+    def read_csv_in_chunks(self, file_path: str, chunk_size: int = None) -> Iterator[pd.DataFrame]:
         chunk_size = chunk_size or Config.CHUNK_SIZE
-        chunks = []
         
         try:
             logger.info(f"Reading CSV file in chunks: {file_path}")
             
-            compression = None
-            if file_path.endswith('.gz'):
-                compression = 'gzip'
-            
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size, compression=compression):
-                chunks.append(chunk)
+            for chunk in self._iter_csv_chunks(file_path, chunk_size):
+                self.total_rows += len(chunk)
                 logger.debug(f"Read chunk with {len(chunk)} rows")
+                yield chunk
             
-            if chunks:
-                combined_df = pd.concat(chunks, ignore_index=True)
-                self.total_rows = len(combined_df)
-                logger.info(f"Total rows read: {self.total_rows}")
-                return combined_df
-            else:
+            if self.total_rows == 0:
                 logger.warning("No data found in CSV file")
-                return pd.DataFrame()
+            else:
+                logger.info(f"Total rows read: {self.total_rows}")
                 
         except Exception as e:
             logger.error(f"Failed to read CSV file: {str(e)}")
             raise
     
+    def load_dataframe(self, file_path: str, chunk_size: int = None) -> pd.DataFrame:
+        # For callers that really need the whole file in memory, e.g. ad-hoc reports
+        return self._concat_fast(list(self.read_csv_in_chunks(file_path, chunk_size)))
+    
+    @staticmethod
+    def _concat_fast(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        if not chunks:
+            return pd.DataFrame()
+        
+        # One allocation per column instead of pd.concat's block-by-block merge
+        columns = {}
+        for column in chunks[0].columns:
+            parts = [chunk[column] for chunk in chunks]
+            dtype = parts[0].dtype
+            if isinstance(dtype, np.dtype) and all(part.dtype == dtype for part in parts):
+                columns[column] = np.concatenate([part.to_numpy() for part in parts])
+            else:
+                # Extension dtypes (string, nullable ints, categories) keep pandas' concat
+                columns[column] = pd.concat(parts, ignore_index=True)
+        
+        return pd.DataFrame(columns, copy=False)
+    
+    def _iter_csv_chunks(self, file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        try:
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            pa_csv = None
+        
+        if pa_csv is None:
+            read_options = {
+                'chunksize': chunk_size,
+                'engine': 'c',
+                'low_memory': False,
+                'dtype': Config.COLUMN_DTYPES,
+                'usecols': list(Config.COLUMN_DTYPES),
+                'na_values': Config.NA_VALUES
+            }
+            if file_path.endswith('.gz'):
+                with self._open_csv(file_path) as source:
+                    with pd.read_csv(source, compression=None, **read_options) as reader:
+                        yield from reader
+            else:
+                # Map the plain CSV so its pages live in the OS cache rather than our RSS
+                with pd.read_csv(file_path, memory_map=True, **read_options) as reader:
+                    yield from reader
+            return
+        
+        arrow_types = {
+            'string': pa.string(),
+            'float64': pa.float64(),
+            'Int32': pa.int32(),
+            'Int8': pa.int8()
+        }
+        # Map Arrow columns straight onto the nullable pandas dtypes in the schema
+        pandas_types = {}
+        for dtype in set(Config.COLUMN_DTYPES.values()):
+            pandas_dtype = pd.api.types.pandas_dtype(dtype)
+            if isinstance(pandas_dtype, pd.api.extensions.ExtensionDtype):
+                pandas_types[arrow_types[dtype]] = pandas_dtype
+        
+        read_options = pa_csv.ReadOptions(block_size=Config.CSV_BLOCK_SIZE)
+        convert_options = pa_csv.ConvertOptions(
+            column_types={column: arrow_types[dtype] for column, dtype in Config.COLUMN_DTYPES.items()},
+            include_columns=list(Config.COLUMN_DTYPES),
+            strings_can_be_null=True
+        )
+        
+        if file_path.endswith('.gz'):
+            source = self._open_csv(file_path)
+        else:
+            source = pa.memory_map(file_path)
+        
+        # Arrow parses large blocks on multiple threads; slicing a RecordBatch is zero-copy
+        with source, pa_csv.open_csv(source, read_options=read_options,
+                                     convert_options=convert_options) as reader:
+            for batch in reader:
+                for offset in range(0, batch.num_rows, chunk_size):
+                    yield batch.slice(offset, chunk_size).to_pandas(types_mapper=pandas_types.get)
+    
+    @log_execution_time
+    def decompress_to_disk(self, gz_path: str, csv_path: str = None) -> str:
+        csv_path = csv_path or Config.DECOMPRESSED_PATH
+        
+        if (os.path.exists(csv_path)
+                and os.path.getmtime(csv_path) >= os.path.getmtime(gz_path)):
+            logger.info(f"Decompressed file is up to date: {csv_path}")
+            return csv_path
+        
+        try:
+            logger.info(f"Decompressing {gz_path} to {csv_path}")
+            os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
+            
+            # Write to a temporary name so an interrupted run never looks up to date
+            partial_path = csv_path + '.partial'
+            with self._open_csv(gz_path) as source, open(partial_path, 'wb') as target:
+                shutil.copyfileobj(source, target, Config.DOWNLOAD_CHUNK_BYTES)
+            os.replace(partial_path, csv_path)
+            
+            return csv_path
+            
+        except Exception as e:
+            logger.error(f"Failed to decompress file: {str(e)}")
+            raise
+    
+    def _open_csv(self, file_path: str):
+        # Prefer parallel (rapidgzip) or SIMD (isal) gzip decoders when installed
+        cpu_count = os.cpu_count() or 1
+        if cpu_count > 1:
+            try:
+                import rapidgzip
+                logger.debug(f"Decompressing with rapidgzip on {cpu_count} threads")
+                return rapidgzip.open(file_path, parallelization=cpu_count)
+            except ImportError:
+                pass
+        
+        try:
+            from isal import igzip
+            logger.debug("Decompressing with isal igzip")
+            return igzip.open(file_path, 'rb')
+        except ImportError:
+            return gzip.open(file_path, 'rb')
+    
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         if df.empty:
             return df
@@ -73,18 +260,11 @@ class DataProcessor:
         
         original_count = len(df)
         
-        df = df.copy()
-        
+        # Each step returns a new frame, so the caller's chunk is never modified
         df = self._remove_duplicates(df)
         df = self._handle_missing_values(df)
-        df = self._convert_data_types(df)
-        
-        df['source_file'] = os.path.basename(Config.DOWNLOAD_PATH)
-        df['processing_batch'] = self.batch_id
-        df['created_at'] = datetime.now()
-        df['updated_at'] = datetime.now()
         
-        self.processed_rows = len(df)
+        self.processed_rows += len(df)
         
         final_count = len(df)
         logger.info(f"Data cleaning completed. Rows: {original_count} -> {final_count}")
@@ -92,53 +272,100 @@ class DataProcessor:
         return df
     
     def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Chunks are cleaned independently, so remember key hashes from earlier
+        # chunks to drop duplicates that span chunk boundaries. Hashing just the
+        # identifying columns avoids hashing wide text columns like description.
         original_count = len(df)
-        df_cleaned = df.drop_duplicates()
+        key_columns = [column for column in Config.DEDUP_COLUMNS if column in df.columns]
+        keys = df[key_columns] if len(key_columns) == len(Config.DEDUP_COLUMNS) else df
+        row_hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        keep_mask = ~pd.Series(row_hashes).duplicated().to_numpy()
+        keep_mask &= ~self._is_seen(row_hashes)
+        df_cleaned = df[keep_mask]
+        # Kept hashes are unique and unseen, so inserting them at their sorted
+        # positions is a linear merge rather than a re-sort of everything seen
+        new_hashes = np.sort(row_hashes[keep_mask])
+        seen = self._seen_row_hashes
+        self._seen_row_hashes = np.insert(seen, np.searchsorted(seen, new_hashes), new_hashes)
         removed_count = original_count - len(df_cleaned)
         logger.info(f"Removed {removed_count} duplicate rows")
         return df_cleaned
     
+    def _is_seen(self, row_hashes: np.ndarray) -> np.ndarray:
+        seen = self._seen_row_hashes
+        positions = np.searchsorted(seen, row_hashes)
+        found = positions < len(seen)
+        found[found] = seen[positions[found]] == row_hashes[found]
+        return found
+    
     def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
         null_counts = df.isnull().sum()
         logger.info(f"Null value counts:\n{null_counts}")
         
-        for column in df.columns:
-            if df[column].dtype in ['int64', 'float64']:
-                median_val = df[column].median()
-                df.loc[:, column] = df[column].fillna(median_val)
-            else:
-                mode_value = df[column].mode()
-                if not mode_value.empty:
-                    df.loc[:, column] = df[column].fillna(mode_value.iloc[0])
-                else:
-                    df.loc[:, column] = df[column].fillna('Unknown')
+        # Only columns with gaps need a fill value; fill them all in one pass
+        columns_with_nulls = null_counts.index[null_counts > 0]
+        if columns_with_nulls.empty:
+            return df
         
-        return df
+        numeric_columns = df[columns_with_nulls].select_dtypes(include='number').columns
+        fill_values = {}
+        for column, median_val in df[numeric_columns].median().items():
+            if pd.isna(median_val):
+                continue
+            if pd.api.types.is_integer_dtype(df[column].dtype):
+                median_val = round(median_val)
+            fill_values[column] = median_val
+        
+        # Mode is a hash-based count per column; the kernels release the GIL,
+        # so the columns can be scanned concurrently
+        text_columns = list(columns_with_nulls.difference(numeric_columns))
+        if text_columns:
+            with ThreadPoolExecutor(max_workers=min(len(text_columns), os.cpu_count() or 1)) as executor:
+                modes = executor.map(self._most_common_value, (df[column] for column in text_columns))
+                fill_values.update(zip(text_columns, modes))
+        
+        return df.fillna(fill_values)
+    
+    @staticmethod
+    def _most_common_value(values: pd.Series):
+        mode_value = values.mode()
+        return mode_value.iloc[0] if not mode_value.empty else 'Unknown'
     
-    def _convert_data_types(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Shrink columns to the narrowest dtype so inserts bind fewer boxed objects
+        compacted_columns = {}
+        
         for column in df.columns:
-            if column in ['source_file', 'processing_batch', 'created_at', 'updated_at']:
-                continue
+            values = df[column]
+            dtype = values.dtype
             
-            if df[column].dtype == 'object':
-                numeric_converted = pd.to_numeric(df[column], errors='coerce')
-                if not numeric_converted.isna().all():
-                    df.loc[:, column] = numeric_converted
-            
-            if df[column].dtype in ['int64']:
-                df.loc[:, column] = pd.to_numeric(df[column], downcast='integer')
-            
-            if df[column].dtype in ['float64']:
-                df.loc[:, column] = pd.to_numeric(df[column], downcast='float')
+            # Floats stay float64: SQLite REAL is always an 8-byte double, and a
+            # float32 round trip would store 532.56 as 532.5599975585938
+            if pd.api.types.is_integer_dtype(dtype):
+                min_value = values.min()
+                if pd.isna(min_value):
+                    # All-NA column (or an empty chunk); nothing to size the downcast on
+                    continue
+                downcast = 'unsigned' if min_value >= 0 else 'integer'
+                compacted_columns[column] = pd.to_numeric(values, downcast=downcast)
+            elif isinstance(dtype, pd.CategoricalDtype):
+                continue
+            elif column in Config.DIMENSION_COLUMNS:
+                compacted_columns[column] = values.astype('category')
+            elif pd.api.types.is_string_dtype(dtype):
+                if values.nunique() <= len(values) * Config.CATEGORY_MAX_UNIQUE_RATIO:
+                    compacted_columns[column] = values.astype('category')
         
-        return df
+        return df.assign(**compacted_columns) if compacted_columns else df
     
     def validate_data(self, df: pd.DataFrame) -> Dict[str, int]:
+        # One null mask serves both the valid-row and null-cell counts
+        null_mask = df.isna().to_numpy()
         metrics = {
             'total_records': len(df),
-            'valid_records': len(df.dropna()),
-            'null_records': df.isnull().sum().sum(),
-            'duplicate_records': len(df) - len(df.drop_duplicates())
+            'valid_records': int((~null_mask.any(axis=1)).sum()),
+            'null_records': int(null_mask.sum()),
+            'duplicate_records': int(df.duplicated().sum())
         }
         
         logger.info(f"Data quality metrics: {metrics}")
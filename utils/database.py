@@ -1,6 +1,11 @@
 import os
+import sqlite3
+from itertools import chain
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, event, text, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Dict, Any
 from config import Config
@@ -8,60 +13,123 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA mmap_size=30000000000"
+]
+
+# Let sqlite3 bind the numpy and pandas scalars that itertuples yields on typed
+# columns, so rows can go to the driver without boxing the frame as objects
+for _numpy_type in (np.int8, np.int16, np.int32, np.int64,
+                    np.uint8, np.uint16, np.uint32, np.uint64, np.bool_):
+    sqlite3.register_adapter(_numpy_type, int)
+sqlite3.register_adapter(np.float32, float)
+sqlite3.register_adapter(type(pd.NA), lambda _: None)
+
+INDEXES = {
+    'idx_processed_data_created_at': ('processed_data', 'created_at'),
+    'idx_processed_data_source_file': ('processed_data', 'source_file'),
+    'idx_processing_log_status': ('processing_log', 'status'),
+    'idx_processing_log_started_at': ('processing_log', 'started_at'),
+    'idx_data_quality_batch_id': ('data_quality_metrics', 'batch_id'),
+    'idx_data_quality_date': ('data_quality_metrics', 'processing_date')
+}
+
+# SQLite's SQLITE_MAX_VARIABLE_NUMBER defaults to 32766 since 3.32
+MAX_BIND_PARAMETERS = 32000
+
 class DatabaseManager:
     def __init__(self, database_url: str = None):
         self.database_url = database_url or Config.DATABASE_URL
         self.engine = None
+        self._dimension_ids = {}
+        self._bulk_connection = None
         self._connect()
     
     def _connect(self):
         try:
-            self.engine = create_engine(self.database_url)
+            engine_options = {}
+            if self._is_sqlite_file_url(make_url(self.database_url)):
+                # Pooled connections are shared between the reader and writer threads.
+                # In-memory databases keep SQLAlchemy's default pool, since every new
+                # connection to :memory: would open a separate, empty database.
+                engine_options = {
+                    'poolclass': QueuePool,
+                    'pool_size': Config.DB_POOL_SIZE,
+                    'pool_pre_ping': False,
+                    'connect_args': {'check_same_thread': False, 'timeout': 60.0}
+                }
+            
+            self.engine = create_engine(self.database_url, **engine_options)
+            
+            if self.engine.dialect.name == 'sqlite':
+                @event.listens_for(self.engine, "connect")
+                def _set_sqlite_pragmas(dbapi_connection, connection_record):
+                    cursor = dbapi_connection.cursor()
+                    for pragma in SQLITE_PRAGMAS:
+                        cursor.execute(pragma)
+                    cursor.close()
+            
             logger.info(f"Connected to database: {self.database_url}")
         except Exception as e:
             logger.error(f"Failed to connect to database: {str(e)}")
             raise
     
     def create_tables(self, schema_file: str = "database_schema.sql"):
+        self.create_tables_no_indexes()
+        self.create_indexes()
+    
+    def create_tables_no_indexes(self):
         try:
             with self.engine.connect() as connection:
+                for table_name, _ in Config.DIMENSION_COLUMNS.values():
+                    connection.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS {table_name} (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL UNIQUE
+                    )
+                    """))
+                
                 processed_data_sql = """
                 CREATE TABLE IF NOT EXISTS processed_data (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    platform_commission_rate TEXT,
-                    venture_category3_name_en TEXT,
+                    platform_commission_rate REAL,
+                    category3_id INTEGER REFERENCES dim_category3(id),
                     product_small_img TEXT,
                     deeplink TEXT,
                     availability TEXT,
                     image_url_5 TEXT,
-                    number_of_reviews TEXT,
-                    is_free_shipping TEXT,
-                    promotion_price TEXT,
-                    venture_category2_name_en TEXT,
-                    current_price TEXT,
+                    number_of_reviews INTEGER,
+                    is_free_shipping INTEGER,
+                    promotion_price REAL,
+                    category2_id INTEGER REFERENCES dim_category2(id),
+                    current_price REAL,
                     product_medium_img TEXT,
-                    venture_category1_name_en TEXT,
-                    brand_name TEXT,
+                    category1_id INTEGER REFERENCES dim_category1(id),
+                    brand_id INTEGER REFERENCES dim_brand(id),
                     image_url_4 TEXT,
                     description TEXT,
                     seller_url TEXT,
-                    product_commission_rate TEXT,
+                    product_commission_rate REAL,
                     product_name TEXT,
-                    sku_id TEXT,
-                    seller_rating TEXT,
-                    bonus_commission_rate TEXT,
+                    sku_id INTEGER,
+                    seller_rating REAL,
+                    bonus_commission_rate REAL,
                     business_type TEXT,
                     business_area TEXT,
                     image_url_2 TEXT,
-                    discount_percentage TEXT,
-                    seller_name TEXT,
+                    discount_percentage REAL,
+                    seller_id INTEGER REFERENCES dim_seller(id),
                     product_url TEXT,
-                    product_id TEXT,
+                    product_id INTEGER,
                     venture_category_name_local TEXT,
-                    rating_avg_value TEXT,
+                    rating_avg_value REAL,
                     product_big_img TEXT,
                     image_url_3 TEXT,
-                    price TEXT,
+                    price REAL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     source_file TEXT,
@@ -70,6 +138,23 @@ class DatabaseManager:
                 """
                 connection.execute(text(processed_data_sql))
                 
+                # Joins the dimension tables back in for human-readable queries
+                dimension_joins = "\n".join(
+                    f"LEFT JOIN {table_name} ON {table_name}.id = p.{id_column}"
+                    for table_name, id_column in Config.DIMENSION_COLUMNS.values()
+                )
+                dimension_names = ",\n".join(
+                    f"{table_name}.name AS {column}"
+                    for column, (table_name, _) in Config.DIMENSION_COLUMNS.items()
+                )
+                connection.execute(text(f"""
+                CREATE VIEW IF NOT EXISTS processed_data_expanded AS
+                SELECT p.*,
+                {dimension_names}
+                FROM processed_data p
+                {dimension_joins}
+                """))
+                
                 processing_log_sql = """
                 CREATE TABLE IF NOT EXISTS processing_log (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -98,18 +183,6 @@ class DatabaseManager:
                 """
                 connection.execute(text(quality_metrics_sql))
                 
-                indexes = [
-                    "CREATE INDEX IF NOT EXISTS idx_processed_data_created_at ON processed_data(created_at)",
-                    "CREATE INDEX IF NOT EXISTS idx_processed_data_source_file ON processed_data(source_file)",
-                    "CREATE INDEX IF NOT EXISTS idx_processing_log_status ON processing_log(status)",
-                    "CREATE INDEX IF NOT EXISTS idx_processing_log_started_at ON processing_log(started_at)",
-                    "CREATE INDEX IF NOT EXISTS idx_data_quality_batch_id ON data_quality_metrics(batch_id)",
-                    "CREATE INDEX IF NOT EXISTS idx_data_quality_date ON data_quality_metrics(processing_date)"
-                ]
-                
-                for index_sql in indexes:
-                    connection.execute(text(index_sql))
-                
                 connection.commit()
             
             logger.info("Database tables created successfully")
@@ -117,6 +190,36 @@ class DatabaseManager:
             logger.error(f"Failed to create tables: {str(e)}")
             raise
     
+    def create_indexes(self):
+        try:
+            with self.engine.connect() as connection:
+                for index_name, (table_name, column) in INDEXES.items():
+                    connection.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({column})"
+                    ))
+                
+                # Refresh planner statistics now that the indexes are populated
+                connection.execute(text("ANALYZE"))
+                connection.commit()
+            
+            logger.info("Database indexes created successfully")
+        except Exception as e:
+            logger.error(f"Failed to create indexes: {str(e)}")
+            raise
+    
+    def drop_indexes(self, table_name: str):
+        try:
+            with self.engine.connect() as connection:
+                for index_name, (index_table, _) in INDEXES.items():
+                    if index_table == table_name:
+                        connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                connection.commit()
+            
+            logger.info(f"Dropped indexes on {table_name}")
+        except Exception as e:
+            logger.error(f"Failed to drop indexes: {str(e)}")
+            raise
+    
     def table_exists(self, table_name: str) -> bool:
         try:
             inspector = inspect(self.engine)
@@ -125,25 +228,88 @@ class DatabaseManager:
             logger.error(f"Failed to check table existence: {str(e)}")
             return False
     
+    def encode_dimensions(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Swap low-cardinality text columns for integer keys into their dimension tables
+        encoded_columns = {}
+        
+        try:
+            for column, (table_name, id_column) in Config.DIMENSION_COLUMNS.items():
+                if column not in df.columns:
+                    continue
+                
+                values = df[column].astype('category')
+                names = [str(name) for name in values.cat.categories]
+                name_to_id = self._dimension_ids.setdefault(table_name, {})
+                new_names = [name for name in names if name not in name_to_id]
+                
+                if new_names:
+                    with self.engine.begin() as connection:
+                        connection.exec_driver_sql(
+                            self._build_insert_sql(table_name, ['name'], 1)
+                            + " ON CONFLICT (name) DO NOTHING",
+                            [(name,) for name in new_names]
+                        )
+                        result = connection.execute(text(f"SELECT id, name FROM {table_name}"))
+                        name_to_id.update((name, id_) for id_, name in result)
+                
+                # Category code -1 marks a missing value and becomes NULL
+                category_ids = pd.array([name_to_id[name] for name in names], dtype='Int64')
+                encoded_columns[id_column] = category_ids.take(
+                    values.cat.codes.to_numpy(), allow_fill=True
+                )
+            
+            dimension_columns = [c for c in Config.DIMENSION_COLUMNS if c in df.columns]
+            return df.drop(columns=dimension_columns).assign(**encoded_columns)
+            
+        except Exception as e:
+            logger.error(f"Failed to encode dimension columns: {str(e)}")
+            raise
+    
     def insert_dataframe(self, df: pd.DataFrame, table_name: str, 
-                        batch_size: int = None) -> int:
+                        batch_size: int = None,
+                        constant_values: Dict[str, Any] = None) -> int:
         batch_size = batch_size or Config.BATCH_SIZE
         total_inserted = 0
         
+        if df.empty:
+            return total_inserted
+        
+        # Values shared by every row are bound per statement, not stored on the frame
+        constant_values = constant_values or {}
+        constants = tuple(constant_values.values())
+        columns = list(df.columns) + list(constant_values)
+        
         try:
-            for i in range(0, len(df), batch_size):
-                batch_df = df.iloc[i:i + batch_size]
-                
-                batch_df.to_sql(
-                    table_name,
-                    self.engine,
-                    if_exists='append',
-                    index=False,
-                    method='multi'
-                )
-                
-                total_inserted += len(batch_df)
-                logger.info(f"Inserted batch {i//batch_size + 1}: {len(batch_df)} rows")
+            # One transaction for the whole load so SQLite syncs once, not per batch
+            if self._uses_sqlite_file():
+                # Bulk rows skip SQLAlchemy entirely; it is kept for DDL and logging
+                bulk_connection = self._get_bulk_connection()
+                cursor = bulk_connection.cursor()
+                began = False
+                try:
+                    cursor.execute("BEGIN")
+                    began = True
+                    cursor.execute("PRAGMA defer_foreign_keys=ON")
+                    total_inserted = self._execute_inserts(
+                        cursor, df, table_name, columns, constants, batch_size
+                    )
+                    cursor.execute("COMMIT")
+                except BaseException:
+                    # BEGIN itself may have failed (e.g. database locked); keep that error
+                    if began and bulk_connection.in_transaction:
+                        cursor.execute("ROLLBACK")
+                    raise
+                finally:
+                    cursor.close()
+            else:
+                with self.engine.begin() as connection:
+                    cursor = connection.connection.cursor()
+                    try:
+                        total_inserted = self._execute_inserts(
+                            cursor, df, table_name, columns, constants, batch_size
+                        )
+                    finally:
+                        cursor.close()
             
             logger.info(f"Total rows inserted: {total_inserted}")
             return total_inserted
@@ -152,6 +318,76 @@ class DatabaseManager:
             logger.error(f"Failed to insert data: {str(e)}")
             raise
     
+    def _execute_inserts(self, cursor, df: pd.DataFrame, table_name: str,
+                         columns: List[str], constants: tuple, batch_size: int) -> int:
+        total_inserted = 0
+        rows_per_statement = max(1, MAX_BIND_PARAMETERS // len(columns))
+        statement_sql = self._build_insert_sql(table_name, columns, rows_per_statement)
+        
+        for i in range(0, len(df), batch_size):
+            batch_df = df.iloc[i:i + batch_size]
+            rows = [row + constants for row in self._iter_db_rows(batch_df)]
+            
+            full_rows = len(rows) - len(rows) % rows_per_statement
+            if full_rows:
+                cursor.executemany(statement_sql, [
+                    list(chain.from_iterable(rows[j:j + rows_per_statement]))
+                    for j in range(0, full_rows, rows_per_statement)
+                ])
+            
+            remaining_rows = rows[full_rows:]
+            if remaining_rows:
+                cursor.execute(
+                    self._build_insert_sql(table_name, columns, len(remaining_rows)),
+                    list(chain.from_iterable(remaining_rows))
+                )
+            
+            total_inserted += len(batch_df)
+            logger.debug(f"Inserted batch {i//batch_size + 1}: {len(batch_df)} rows")
+        
+        return total_inserted
+    
+    def _uses_sqlite_file(self) -> bool:
+        return self._is_sqlite_file_url(self.engine.url)
+    
+    @staticmethod
+    def _is_sqlite_file_url(url) -> bool:
+        return (url.get_backend_name() == 'sqlite'
+                and url.database not in (None, '', ':memory:'))
+    
+    def _get_bulk_connection(self) -> sqlite3.Connection:
+        if self._bulk_connection is None:
+            connection = sqlite3.connect(
+                self.engine.url.database,
+                isolation_level=None,
+                check_same_thread=False,
+                timeout=60.0
+            )
+            for pragma in SQLITE_PRAGMAS:
+                connection.execute(pragma)
+            self._bulk_connection = connection
+        return self._bulk_connection
+    
+    def _build_insert_sql(self, table_name: str, columns: List[str], row_count: int) -> str:
+        placeholder = '?' if self.engine.dialect.paramstyle == 'qmark' else '%s'
+        row_sql = "(" + ", ".join([placeholder] * len(columns)) + ")"
+        column_sql = ", ".join(f'"{column}"' for column in columns)
+        return f'INSERT INTO "{table_name}" ({column_sql}) VALUES ' + ", ".join([row_sql] * row_count)
+    
+    def _iter_db_rows(self, df: pd.DataFrame):
+        if self.engine.dialect.name == 'sqlite':
+            # Typed columns yield native scalars; the rest use the adapters registered above
+            return df.itertuples(index=False, name=None)
+        return self._to_db_values(df).itertuples(index=False, name=None)
+    
+    @staticmethod
+    def _to_db_values(df: pd.DataFrame) -> pd.DataFrame:
+        # DBAPI drivers only bind plain Python scalars, so box values and map NA to None
+        values = df.astype(object)
+        for column in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+            values[column] = df[column].astype(str)
+        return values.where(df.notna(), None)
+    
     def log_processing_status(self, file_name: str, total_rows: int, 
                             processed_rows: int, status: str, 
                             error_message: str = None, 
@@ -205,6 +441,10 @@ class DatabaseManager:
             logger.error(f"Failed to log data quality metrics: {str(e)}")
     
     def close(self):
+        if self._bulk_connection is not None:
+            self._bulk_connection.close()
+            self._bulk_connection = None
+        
         if self.engine:
             self.engine.dispose()
             logger.info("Database connection closed") 
\ No newline at end of file
@@ -1,6 +1,7 @@
+import functools
 import logging
 import os
-from datetime import datetime
+import time
 from logging.handlers import RotatingFileHandler
 from config import Config
 
@@ -53,6 +54,8 @@ def setup_logger(name: str = "data_processor") -> logging.Logger:
     
     return logger
 
+_LOGGER = setup_logger()
+
 def log_execution_time(func):
     """
     Decorator to log function execution time.
@@ -63,21 +66,21 @@ def log_execution_time(func):
     Returns:
         Decorated function
     """
+    logger = _LOGGER
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger = setup_logger()
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         logger.info(f"Starting {func.__name__}")
         
         try:
             result = func(*args, **kwargs)
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - start_time) / 1e9
             logger.info(f"Completed {func.__name__} in {execution_time:.2f} seconds")
             return result
         except Exception as e:
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - start_time) / 1e9
             logger.error(f"Failed {func.__name__} after {execution_time:.2f} seconds: {str(e)}")
             raise
     
-    return wrapper 
\ No newline at end of file
+    return wrapper
\ No newline at end of file